@@ -1,8 +1,15 @@
 import os
 from dotenv import load_dotenv
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlmodel import SQLModel, Session
 from typing import Generator, Optional
+from src.dependencies.admission import (
+    DB_MAX_CONCURRENCY,
+    admission_controller,
+    client_rate_limiter,
+)
+from src.dependencies.background import GRACEFUL_SHUTDOWN_SECONDS, background_tasks
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,6 +22,10 @@ SNOWFLAKE_DATABASE = os.getenv("SNOWFLAKE_DATABASE")
 SNOWFLAKE_SCHEMA = os.getenv("SNOWFLAKE_SCHEMA")
 SNOWFLAKE_WAREHOUSE = os.getenv("SNOWFLAKE_WAREHOUSE")
 SNOWFLAKE_ROLE = os.getenv("SNOWFLAKE_ROLE")
+# Snowflake cancels statements running longer than this, so slow queries fail fast
+SNOWFLAKE_STATEMENT_TIMEOUT_SECONDS = int(
+    os.getenv("SNOWFLAKE_STATEMENT_TIMEOUT_SECONDS", "30")
+)
 
 # Global variables for engine and session
 engine: Optional[object] = None
@@ -71,6 +82,13 @@ def init_database():
             CONNECTION_STRING,
             echo=False,  # Set to True for debugging
             pool_pre_ping=True,
+            # One pooled connection per admission slot
+            pool_size=DB_MAX_CONCURRENCY,
+            connect_args={
+                "session_parameters": {
+                    "STATEMENT_TIMEOUT_IN_SECONDS": SNOWFLAKE_STATEMENT_TIMEOUT_SECONDS
+                }
+            },
         )
 
         # Session will be created directly using SQLModel.Session
@@ -96,12 +114,56 @@ def create_db_and_tables():
         print(f"Failed to create tables: {str(e)}")
 
 
-def get_session() -> Generator:
-    """Get database session"""
+def close_database():
+    """
+    Close pooled connections on shutdown.
+    uvicorn has already waited (timeout_graceful_shutdown) for in-flight requests;
+    background refreshes get the same timeout here. Connections still checked out
+    by a running query are closed when returned.
+    """
+    global engine, SessionLocal
+    if engine is None:
+        return
+
+    still_running = background_tasks.stop(GRACEFUL_SHUTDOWN_SECONDS)
+    if still_running:
+        print(f"Closing database with {still_running} background refreshes still running")
+
+    if admission_controller.active > 0:
+        print(
+            f"Closing database with {admission_controller.active} queries still running"
+        )
+
+    engine.dispose()
+    engine = None
+    SessionLocal = None
+    print("Database connections closed")
+
+
+def get_session(request: Request) -> Generator:
+    """
+    Get database session once the client's rate limit admits the request.
+    Queries made through it take a global slot only while they run (see admitted),
+    so responses served from cache never wait on Snowflake.
+    """
     if SessionLocal is None:
         raise Exception(
             "Database not initialized. Please set up your .env file with Snowflake credentials."
         )
 
+    client_rate_limiter.check(request.client.host if request.client else "unknown")
     with Session(SessionLocal) as session:
         yield session
+
+
+def get_admitted_session(request: Request) -> Generator:
+    """Get database session holding a global slot for the whole request, for writes"""
+    if SessionLocal is None:
+        raise Exception(
+            "Database not initialized. Please set up your .env file with Snowflake credentials."
+        )
+
+    client_rate_limiter.check(request.client.host if request.client else "unknown")
+    with admission_controller.slot():
+        with Session(SessionLocal) as session:
+            yield session
@@ -0,0 +1,158 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from fastapi import HTTPException
+
+from src.dependencies.logger_config import get_logger
+
+logger = get_logger("admission")
+
+# Maximum number of requests holding a Snowflake session at once
+DB_MAX_CONCURRENCY = int(os.getenv("DB_MAX_CONCURRENCY", "8"))
+# Maximum number of requests waiting for a free slot
+DB_QUEUE_SIZE = int(os.getenv("DB_QUEUE_SIZE", "32"))
+# How long (seconds) a queued request waits for a slot before giving up
+DB_QUEUE_TIMEOUT_SECONDS = float(os.getenv("DB_QUEUE_TIMEOUT_SECONDS", "5"))
+# Threads beyond active + queued requests, so overflow requests can still be shed quickly
+THREADPOOL_HEADROOM = int(os.getenv("THREADPOOL_HEADROOM", "16"))
+# Sync handlers run in the threadpool, and requests queued for a slot each hold a thread
+THREADPOOL_SIZE = DB_MAX_CONCURRENCY + DB_QUEUE_SIZE + THREADPOOL_HEADROOM
+# Per-client token bucket: sustained requests per second and burst size
+CLIENT_RATE_PER_SECOND = float(os.getenv("CLIENT_RATE_PER_SECOND", "20"))
+CLIENT_BURST = float(os.getenv("CLIENT_BURST", "40"))
+# Forget idle clients once this many are tracked
+CLIENT_MAX_TRACKED = int(os.getenv("CLIENT_MAX_TRACKED", "10000"))
+
+
+class ClientRateLimiter:
+    """Token bucket per client; refills at rate tokens per second up to burst"""
+
+    def __init__(
+        self,
+        rate: float = CLIENT_RATE_PER_SECOND,
+        burst: float = CLIENT_BURST,
+        max_tracked: int = CLIENT_MAX_TRACKED,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_tracked = max_tracked
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def check(self, client: str, cost: float = 1):
+        """Take cost tokens for client, or raise a 429 with Retry-After"""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < cost:
+                self._buckets[client] = (tokens, now)
+                retry_after = math.ceil((cost - tokens) / self.rate)
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many requests",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            self._buckets[client] = (tokens - cost, now)
+            if len(self._buckets) > self.max_tracked:
+                self._evict_idle(now)
+
+    def _evict_idle(self, now: float):
+        # A bucket idle long enough to have refilled completely carries no state
+        full_after = self.burst / self.rate
+        idle = [
+            client
+            for client, (_, updated) in self._buckets.items()
+            if now - updated >= full_after
+        ]
+        for client in idle:
+            del self._buckets[client]
+
+
+class AdmissionController:
+    """
+    Global budget of concurrent Snowflake sessions.
+    Requests beyond the budget wait in a bounded queue until a slot frees up or
+    the queue timeout passes; once the queue is full they are shed with a 503.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DB_MAX_CONCURRENCY,
+        queue_size: int = DB_QUEUE_SIZE,
+        queue_timeout: float = DB_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.active = 0
+
+    def _overloaded(self, reason: str) -> HTTPException:
+        logger.warning(f"Shedding request: {reason}")
+        return HTTPException(
+            status_code=503,
+            detail="Service is busy, please retry",
+            headers={"Retry-After": str(max(1, math.ceil(self.queue_timeout)))},
+        )
+
+    @contextmanager
+    def slot(self, wait: bool = True):
+        """Hold one concurrency slot for the duration of the block"""
+        if not self._slots.acquire(blocking=False):
+            if not wait:
+                raise self._overloaded("no free database slot")
+            with self._lock:
+                if self.waiting >= self.queue_size:
+                    raise self._overloaded("wait queue is full")
+                self.waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                raise self._overloaded("timed out waiting for a database slot")
+
+        with self._lock:
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "max_concurrency": self.max_concurrency,
+                "queue_size": self.queue_size,
+            }
+
+
+admission_controller = AdmissionController()
+client_rate_limiter = ClientRateLimiter()
+
+
+@contextmanager
+def admitted(session, wait: bool = True):
+    """
+    Hold a slot while session queries Snowflake, and close the session on the way
+    out so its connection goes back to the pool before the slot is freed
+    """
+    with admission_controller.slot(wait):
+        try:
+            yield
+        finally:
+            session.close()
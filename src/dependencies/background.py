@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+from typing import Callable, Set
+
+# Seconds to let in-flight requests and background queries finish on shutdown
+GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+
+
+class BackgroundTasks:
+    """
+    Threads doing Snowflake work outside a request (cache refreshes, dimension
+    rebuilds), tracked so shutdown can wait for them before closing the engine
+    """
+
+    def __init__(self):
+        self._threads: Set[threading.Thread] = set()
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    def start(self, target: Callable[[], None]) -> bool:
+        """Run target on a new thread; False, without starting it, once shutdown has begun"""
+
+        def run():
+            try:
+                target()
+            finally:
+                with self._lock:
+                    self._threads.discard(threading.current_thread())
+
+        with self._lock:
+            if self._stopping:
+                return False
+            thread = threading.Thread(target=run, daemon=True)
+            self._threads.add(thread)
+        thread.start()
+        return True
+
+    def stop(self, timeout: float) -> int:
+        """
+        Refuse new threads and wait up to timeout seconds for running ones.
+        Returns how many are still running.
+        """
+        with self._lock:
+            self._stopping = True
+            threads = list(self._threads)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        return sum(thread.is_alive() for thread in threads)
+
+
+background_tasks = BackgroundTasks()
@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from src.dependencies.logger_config import get_logger
+
+logger = get_logger("circuit_breaker")
+
+# Consecutive failed or slow queries before the breaker opens
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+# Seconds the breaker stays open before letting a trial query through
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+# Queries slower than this count as failures even if they succeed
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", "10"))
+# Dimension index scans read whole tables, so they get a longer slow threshold
+INDEX_SLOW_QUERY_SECONDS = float(os.getenv("INDEX_SLOW_QUERY_SECONDS", "60"))
+
+
+class CircuitOpenError(Exception):
+    """Raised when a query is refused because the circuit breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit breaker is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops sending queries to Snowflake after repeated failures or slow queries.
+    After reset_timeout seconds one trial query is let through (half-open); its
+    outcome closes the breaker again or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_SECONDS,
+        slow_call_seconds: float = SLOW_QUERY_SECONDS,
+        name: str = "Snowflake",
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def _allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def is_open(self) -> bool:
+        """Whether queries would currently be refused (without claiming a trial)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self._opened_at < self.reset_timeout
+            return self.state == self.HALF_OPEN and self._trial_in_flight
+
+    def _record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"{self.name} circuit breaker closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"{self.name} circuit breaker opened after {self._failures} failures"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn if the breaker allows it, recording failures and slow calls"""
+        if not self._allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self._record_failure()
+            raise
+        if time.monotonic() - started > self.slow_call_seconds:
+            self._record_failure()
+        else:
+            self._record_success()
+        return result
+
+
+circuit_breaker = CircuitBreaker()
+# Separate breaker for dimension index maintenance so failing background scans
+# don't shed API requests
+index_breaker = CircuitBreaker(
+    slow_call_seconds=INDEX_SLOW_QUERY_SECONDS, name="Dimension index"
+)
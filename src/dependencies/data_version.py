@@ -0,0 +1,106 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from src.dependencies.admission import admitted
+from src.dependencies.circuit_breaker import circuit_breaker
+from src.dependencies.logger_config import get_logger
+
+logger = get_logger("data_version")
+
+# How often (seconds) to re-read table modification times from Snowflake
+DATA_VERSION_CHECK_SECONDS = float(os.getenv("DATA_VERSION_CHECK_SECONDS", "60"))
+
+# Touched on every write through the API. Each worker has its own _local_writes,
+# so the file's mtime is what lets a write in one worker invalidate the others
+DATA_VERSION_FILE = os.getenv(
+    "DATA_VERSION_FILE", os.path.join(tempfile.gettempdir(), "covid_api_data_version")
+)
+
+# Tables whose contents back the API; any change to one of them bumps the version
+TRACKED_TABLES = (
+    "GOLD_FACT_COVID_DEATHS",
+    "GOLD_FACT_UKHSA_VACCINATIONS",
+    "FACT_CA_DEMAND",
+    "FACT_CA_ANTIBODY",
+)
+
+_lock = threading.Lock()
+_local_writes = 0
+_table_fingerprint: Optional[str] = None
+_checked_at = 0.0
+
+
+def bump_data_version():
+    """Mark the data as changed after a write made through this API"""
+    global _local_writes
+    with _lock:
+        _local_writes += 1
+    try:
+        with open(DATA_VERSION_FILE, "a"):
+            os.utime(DATA_VERSION_FILE)
+    except OSError as e:
+        logger.warning(f"Could not mark data version for other workers: {str(e)}")
+
+
+def _shared_writes() -> Optional[int]:
+    """Time of the last write made through the API by any worker on this host"""
+    try:
+        return os.stat(DATA_VERSION_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_table_fingerprint(session: Session) -> Optional[str]:
+    """Return the latest LAST_ALTERED timestamp of the tracked tables"""
+    try:
+        placeholders = ", ".join(f":t{i}" for i in range(len(TRACKED_TABLES)))
+        statement = text(
+            "SELECT MAX(LAST_ALTERED) FROM INFORMATION_SCHEMA.TABLES "
+            f"WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME IN ({placeholders})"
+        )
+        params = {f"t{i}": name for i, name in enumerate(TRACKED_TABLES)}
+        # Never queue for this: the caller may be about to answer from cache
+        with admitted(session, wait=False):
+            value = circuit_breaker.call(
+                lambda: session.execute(statement, params).scalar()
+            )
+        return str(value) if value is not None else None
+    except Exception as e:
+        logger.warning(f"Could not read table modification times: {str(e)}")
+        return None
+
+
+def get_data_version(
+    session: Optional[Session] = None,
+) -> Tuple[int, Optional[int], Optional[str]]:
+    """
+    Get the current data version.
+    The version combines writes made through this API (by this worker and, via
+    DATA_VERSION_FILE, by other workers on the same host) with the last time
+    Snowflake reports the tracked tables were altered (re-read at most every
+    DATA_VERSION_CHECK_SECONDS when a session is supplied, and not at all while
+    the circuit breaker is open).
+    """
+    global _table_fingerprint, _checked_at
+    read = False
+    if session is not None and not circuit_breaker.is_open():
+        with _lock:
+            now = time.monotonic()
+            # Claim the check before querying so concurrent callers don't all issue it
+            if now - _checked_at >= DATA_VERSION_CHECK_SECONDS:
+                _checked_at = now
+                read = True
+    if read:
+        fingerprint = _read_table_fingerprint(session)
+        if fingerprint is not None:
+            with _lock:
+                _table_fingerprint = fingerprint
+    shared = _shared_writes()
+    with _lock:
+        return _local_writes, shared, _table_fingerprint
@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from src import database
+from src.dependencies.admission import admitted
+from src.dependencies.background import background_tasks
+from src.dependencies.circuit_breaker import index_breaker
+from src.dependencies.data_version import get_data_version
+from src.dependencies.logger_config import get_logger
+from src.models.gold_ca_fact_tables import gold_fact_ca_demand, gold_fact_ca_antibody
+from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+from src.models.gold_fact_ukhsa_vaccinations import gold_fact_ukhsa_vaccinations
+
+logger = get_logger("dimensions")
+
+# Backoff (seconds) between retries of dimensions that failed to load
+DIMENSION_RETRY_MIN_SECONDS = float(os.getenv("DIMENSION_RETRY_MIN_SECONDS", "5"))
+DIMENSION_RETRY_MAX_SECONDS = float(os.getenv("DIMENSION_RETRY_MAX_SECONDS", "300"))
+
+# Dimension name -> (model, column holding the distinct values)
+DIMENSIONS = {
+    "us_jurisdictions": (gold_fact_covid_deaths, "JURISDICTION_RESIDENCE_NAME"),
+    "us_months": (gold_fact_covid_deaths, "MONTH_NAME"),
+    "us_demographic_groups": (gold_fact_covid_deaths, "DEMOGRAPHIC_GROUP_NAME"),
+    "us_subgroups": (gold_fact_covid_deaths, "SUBGROUP1_NAME"),
+    "ukhsa_areas": (gold_fact_ukhsa_vaccinations, "AREA_NAME"),
+    "ukhsa_age_categories": (gold_fact_ukhsa_vaccinations, "AGE_CATEGORY"),
+    "ukhsa_dose_labels": (gold_fact_ukhsa_vaccinations, "DOSE_LABEL"),
+    "ca_demand_geos": (gold_fact_ca_demand, "GEO"),
+    "ca_demand_naics": (gold_fact_ca_demand, "NAICS"),
+    "ca_antibody_geos": (gold_fact_ca_antibody, "GEO"),
+}
+
+
+# 404 detail for a value a dimension doesn't hold; shared by the routes and /batch
+NOT_FOUND_DETAILS = {
+    "us_jurisdictions": "No data found for jurisdiction name",
+    "us_months": "No data found for month name",
+    "us_demographic_groups": "No data found for demographic group",
+    "us_subgroups": "No data found for subgroup",
+    "ukhsa_areas": "No data found for area name",
+    "ukhsa_age_categories": "No data found for age category",
+    "ukhsa_dose_labels": "No data found for dose type",
+    "ca_demand_geos": "No data found for geo",
+    "ca_demand_naics": "No data found for NAICS code",
+    "ca_antibody_geos": "No data found for geo",
+}
+
+
+def dimension_for(model, column: str) -> Optional[str]:
+    """Name of the dimension indexing model.column, if there is one"""
+    for name, indexed in DIMENSIONS.items():
+        if indexed == (model, column):
+            return name
+    return None
+
+
+class Dimension:
+    """Sorted distinct values of one column, searchable by case-insensitive prefix"""
+
+    def __init__(self, values: List[str]):
+        pairs = sorted((value.casefold(), value) for value in set(values))
+        self._folded = [folded for folded, _ in pairs]
+        self.values = [value for _, value in pairs]
+        self._members = frozenset(self.values)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._members
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def search(self, prefix: str = "", limit: Optional[int] = None) -> List[str]:
+        """Return up to limit values starting with prefix (case-insensitive), in sorted order"""
+        if limit is not None and limit < 1:
+            return []
+        if not prefix:
+            return self.values[:limit] if limit is not None else list(self.values)
+        folded_prefix = prefix.casefold()
+        start = bisect_left(self._folded, folded_prefix)
+        matches = []
+        for i in range(start, len(self._folded)):
+            if not self._folded[i].startswith(folded_prefix):
+                break
+            matches.append(self.values[i])
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+
+class DimensionIndex:
+    """
+    In-memory index of distinct dimension values, rebuilt in the background when
+    the data version changes. Dimensions that fail to load keep their previous
+    values (if any) and are retried with exponential backoff.
+    """
+
+    def __init__(self):
+        self._dimensions: Dict[str, Dimension] = {}
+        self._version: Optional[Tuple[Any, ...]] = None
+        self._failed: Set[str] = set()
+        self._retry_at = 0.0
+        self._retry_backoff = DIMENSION_RETRY_MIN_SECONDS
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._dimensions)
+
+    def _needs_build(self, version) -> bool:
+        if self._version != version:
+            return True
+        return bool(self._failed) and time.monotonic() >= self._retry_at
+
+    def build(self, session: Session):
+        """Load the distinct values of every dimension from Snowflake"""
+        with self._lock:
+            version = get_data_version(session)
+            # Another caller may have rebuilt while this one waited for the lock
+            if self._dimensions and not self._needs_build(version):
+                return
+            dimensions = {}
+            failed = set()
+            with admitted(session):
+                for name, (model, column) in DIMENSIONS.items():
+                    statement = select(getattr(model, column)).distinct()
+                    try:
+                        rows = index_breaker.call(lambda: session.exec(statement).all())
+                    except Exception as e:
+                        # Keep serving the previous values; retry this dimension later
+                        logger.error(f"Failed to load dimension {name}: {str(e)}")
+                        session.rollback()
+                        failed.add(name)
+                        if name in self._dimensions:
+                            dimensions[name] = self._dimensions[name]
+                        continue
+                    values = [value for value in rows if value is not None]
+                    dimensions[name] = Dimension([str(value) for value in values])
+            if len(failed) == len(DIMENSIONS):
+                self._schedule_retry(failed)
+                raise Exception("No dimensions could be loaded")
+            # Swap in the new index in one step so readers never see a partial build
+            self._dimensions = dimensions
+            self._version = version
+            self._schedule_retry(failed)
+            logger.info(
+                f"Dimension index built: "
+                f"{', '.join(f'{name}={len(dim)}' for name, dim in dimensions.items())}"
+            )
+
+    def _schedule_retry(self, failed: Set[str]):
+        self._failed = failed
+        if failed:
+            self._retry_at = time.monotonic() + self._retry_backoff
+            self._retry_backoff = min(
+                self._retry_backoff * 2, DIMENSION_RETRY_MAX_SECONDS
+            )
+        else:
+            self._retry_backoff = DIMENSION_RETRY_MIN_SECONDS
+
+    def _rebuild_in_background(self):
+        try:
+            if database.engine is None:
+                return
+            with Session(database.engine) as session:
+                self.build(session)
+        except Exception as e:
+            logger.error(f"Failed to refresh dimension index: {str(e)}")
+        finally:
+            with self._state_lock:
+                self._rebuilding = False
+
+    def refresh(self):
+        """
+        Start a background rebuild if the data has changed since the index was
+        built, or a failed dimension is due for a retry. Never blocks the caller.
+        """
+        if not self._needs_build(get_data_version()):
+            return
+        with self._state_lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        if not background_tasks.start(self._rebuild_in_background):
+            with self._state_lock:
+                self._rebuilding = False
+
+    def get(self, name: str) -> Optional[Dimension]:
+        return self._dimensions.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._dimensions)
+
+
+dimension_index = DimensionIndex()
+
+
+def require_known(name: str, value: str):
+    """
+    Raise a 404 if value is not a known value of the dimension.
+    Does nothing while the dimension is unavailable so requests still reach Snowflake.
+    """
+    if dimension_index.loaded:
+        dimension_index.refresh()
+    dimension = dimension_index.get(name)
+    if dimension is not None and value not in dimension:
+        logger.info(f"Rejected unknown {name} value: {value}")
+        raise HTTPException(status_code=404, detail=NOT_FOUND_DETAILS[name])
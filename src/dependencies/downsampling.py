@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+    Always keeps the first and last point; each bucket in between keeps the point
+    forming the largest triangle with the previously kept point and the average of
+    the next bucket. The per-bucket search is vectorized with numpy.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1])[:max_points]
+
+    # Interior points [1, n - 1) split into max_points - 2 buckets
+    edges = 1 + (np.arange(max_points - 1) * (n - 2)) // (max_points - 2)
+    selected = np.empty(max_points, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i == max_points - 3:
+            next_x, next_y = x[n - 1], y[n - 1]
+        else:
+            next_x = x[end : edges[i + 2]].mean()
+            next_y = y[end : edges[i + 2]].mean()
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum point of each of (max_points - 2) // 2
+    equal buckets, plus the first and last point, in their original order.
+    """
+    n = len(y)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 4:
+        return np.array([0, n - 1])[:max_points]
+
+    n_buckets = (max_points - 2) // 2
+    bucket = (np.arange(n) * n_buckets) // n
+    # Sort by bucket, then value: each bucket's min is first and its max is last
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket, np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    kept = np.concatenate(([0, n - 1], order[starts], order[ends]))
+    return np.unique(kept)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = "lttb") -> np.ndarray:
+    """Indices of the points to keep from the (x, y) series, ignoring NaN values"""
+    valid = np.flatnonzero(~np.isnan(y))
+    if method == "minmax":
+        kept = minmax_indices(y[valid], max_points)
+    else:
+        kept = lttb_indices(x[valid], y[valid], max_points)
+    return valid[kept]
@@ -0,0 +1,191 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlmodel import Session, select, func
+
+from src.dependencies.admission import admitted
+from src.dependencies.circuit_breaker import circuit_breaker
+from src.dependencies.data_version import get_data_version
+from src.dependencies.logger_config import get_logger
+from src.dependencies.resilience import cached_query, guarded
+from src.models.page import Page
+
+logger = get_logger("pagination")
+
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1024"))
+
+
+class CountCache:
+    """LRU cache of row counts keyed by table and filter, tagged with the data version"""
+
+    def __init__(self, max_entries: int = COUNT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Any) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                # Data changed since this count was taken
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, version: Any, count: int):
+        with self._lock:
+            self._entries[key] = (version, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
+
+
+def _filter_key(model, filters: Dict[str, Any]) -> Tuple:
+    return (model.__tablename__, tuple(sorted(filters.items())))
+
+
+def _approximate_count(session: Session, model) -> Optional[int]:
+    """Read the row count Snowflake keeps in table metadata (no table scan)"""
+    try:
+        statement = text(
+            "SELECT ROW_COUNT FROM INFORMATION_SCHEMA.TABLES "
+            "WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME = :table_name"
+        )
+        value = circuit_breaker.call(
+            lambda: session.execute(
+                statement, {"table_name": model.__tablename__.upper()}
+            ).scalar()
+        )
+        return int(value) if value is not None else None
+    except Exception as e:
+        logger.warning(
+            f"Could not read approximate row count for {model.__tablename__}: {str(e)}"
+        )
+        return None
+
+
+def count_rows(
+    session: Session,
+    model,
+    filters: Dict[str, Any],
+    approximate: bool = False,
+) -> Tuple[int, bool]:
+    """
+    Count rows of model matching the equality filters.
+    Returns (total, is_approximate). Counts are cached per filter until the
+    data version changes. Approximate counts are only used for unfiltered scans.
+    """
+    version = get_data_version(session)
+
+    if approximate and not filters:
+        key = (model.__tablename__, "approximate")
+        cached = count_cache.get(key, version)
+        if cached is not None:
+            return cached, True
+        with admitted(session):
+            estimate = _approximate_count(session, model)
+        if estimate is not None:
+            count_cache.set(key, version, estimate)
+            return estimate, True
+
+    key = _filter_key(model, filters)
+    cached = count_cache.get(key, version)
+    if cached is not None:
+        return cached, False
+
+    statement = select(func.count()).select_from(model).where(
+        *[getattr(model, name) == value for name, value in filters.items()]
+    )
+    with admitted(session):
+        total = guarded(lambda: session.exec(statement).one())
+    count_cache.set(key, version, total)
+    return total, False
+
+
+def page_statement(model, filters: Dict[str, Any], limit: int, offset: int):
+    """
+    Select one page of model rows matching the equality filters.
+    Rows are ordered by primary key so pages are stable and the batch route can
+    reproduce the same page inside a merged query.
+    """
+    return (
+        select(model)
+        .where(*[getattr(model, name) == value for name, value in filters.items()])
+        .order_by(*model.__table__.primary_key.columns)
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def _link_header(request: Request, total: int, limit: int, offset: int) -> str:
+    def page_url(page_offset: int) -> str:
+        return str(request.url.include_query_params(limit=limit, offset=page_offset))
+
+    links = [f'<{page_url(0)}>; rel="first"']
+    if offset > 0:
+        links.append(f'<{page_url(max(offset - limit, 0))}>; rel="prev"')
+    if offset + limit < total:
+        links.append(f'<{page_url(offset + limit)}>; rel="next"')
+    last_offset = ((total - 1) // limit) * limit if total > 0 else 0
+    links.append(f'<{page_url(last_offset)}>; rel="last"')
+    return ", ".join(links)
+
+
+def paginate(
+    session: Session,
+    request: Request,
+    response: Response,
+    model,
+    filters: Dict[str, Any],
+    limit: int,
+    offset: int,
+    envelope: bool = False,
+    approximate: bool = False,
+):
+    """Fetch one page of rows matching the filters, with X-Total-Count and Link headers"""
+    statement = page_statement(model, filters, limit, offset)
+    items: List = cached_query(session, response, statement)
+
+    total: Optional[int] = None
+    is_approximate = False
+    if len(items) < limit and (items or offset == 0):
+        # A short page is the last page, so the total is known without COUNT(*)
+        total = offset + len(items)
+        if response.headers.get("X-Cache") != "STALE":
+            count_cache.set(_filter_key(model, filters), get_data_version(), total)
+    else:
+        try:
+            total, is_approximate = count_rows(session, model, filters, approximate)
+        except Exception as e:
+            logger.warning(f"Could not count {model.__tablename__} rows: {str(e)}")
+
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+        if is_approximate:
+            response.headers["X-Total-Count-Approximate"] = "true"
+        if limit > 0:
+            response.headers["Link"] = _link_header(request, total, limit, offset)
+
+    if envelope:
+        return Page(
+            items=items,
+            total=total,
+            approximate=is_approximate,
+            limit=limit,
+            offset=offset,
+        )
+    return items
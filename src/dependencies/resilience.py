@@ -0,0 +1,184 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlmodel import Session
+
+from src import database
+from src.dependencies.admission import admitted
+from src.dependencies.background import background_tasks
+from src.dependencies.circuit_breaker import CircuitOpenError, circuit_breaker
+from src.dependencies.data_version import get_data_version
+from src.dependencies.logger_config import get_logger
+
+logger = get_logger("resilience")
+
+# Seconds a cached result is served without revalidation
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "300"))
+# Seconds past which a stale result is no longer served
+QUERY_CACHE_MAX_STALE_SECONDS = float(os.getenv("QUERY_CACHE_MAX_STALE_SECONDS", "86400"))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "2048"))
+# Seconds a request waits for another request's reload of the same query after a data change
+QUERY_CACHE_RELOAD_WAIT_SECONDS = float(os.getenv("QUERY_CACHE_RELOAD_WAIT_SECONDS", "10"))
+
+
+class ResultCache:
+    """LRU cache of query results with the time and data version they were loaded at"""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, Any]]" = OrderedDict()
+        self._refreshing: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, value: Any, version: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def claim_refresh(self, key: Hashable) -> bool:
+        """Mark key as being refreshed; False if a refresh is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing[key] = threading.Event()
+            return True
+
+    def release_refresh(self, key: Hashable):
+        with self._lock:
+            done = self._refreshing.pop(key, None)
+        if done is not None:
+            done.set()
+
+    def wait_for_refresh(self, key: Hashable, timeout: float) -> bool:
+        """Wait for a running refresh of key to finish; False if it is still running"""
+        with self._lock:
+            done = self._refreshing.get(key)
+        return done is None or done.wait(timeout)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+result_cache = ResultCache()
+
+
+def guarded(fn: Callable[[], Any]) -> Any:
+    """Run a query through the circuit breaker, turning an open breaker into a 503"""
+    try:
+        return circuit_breaker.call(fn)
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Snowflake is unavailable, please retry",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+
+
+def _refresh_in_background(key: Hashable, loader: Callable[[Session], Any]):
+    def refresh():
+        try:
+            if database.engine is None:
+                return
+            with Session(database.engine) as session:
+                version = get_data_version(session)
+                with admitted(session):
+                    value = circuit_breaker.call(lambda: loader(session))
+            result_cache.set(key, value, version)
+        except Exception as e:
+            logger.warning(f"Background refresh failed: {str(e)}")
+        finally:
+            result_cache.release_refresh(key)
+
+    if result_cache.claim_refresh(key) and not background_tasks.start(refresh):
+        result_cache.release_refresh(key)
+
+
+def _mark_stale(response: Response, stored_at: float):
+    response.headers["X-Cache"] = "STALE"
+    response.headers["Age"] = str(int(time.monotonic() - stored_at))
+    response.headers["Warning"] = '110 - "Response is Stale"'
+    if circuit_breaker.is_open():
+        response.headers["X-Circuit-State"] = "open"
+
+
+def statement_key(statement) -> str:
+    """Cache key for a SQL statement: its text with parameters inlined"""
+    return str(statement.compile(compile_kwargs={"literal_binds": True}))
+
+
+def _load(
+    session: Session,
+    response: Response,
+    key: Hashable,
+    loader: Callable[[Session], Any],
+) -> Any:
+    """Run the query now and cache the result under the current data version"""
+    version = get_data_version(session)
+    with admitted(session):
+        value = guarded(lambda: loader(session))
+    result_cache.set(key, value, version)
+    response.headers["X-Cache"] = "MISS"
+    return value
+
+
+def cached_query(session: Session, response: Response, statement) -> Any:
+    """Run a read statement through the stale-while-revalidate result cache"""
+    key = statement_key(statement)
+
+    def loader(s: Session):
+        return s.exec(statement).all()
+
+    entry = result_cache.get(key)
+    if entry is not None:
+        value, stored_at, version = entry
+        age = time.monotonic() - stored_at
+        servable = age <= QUERY_CACHE_MAX_STALE_SECONDS
+        if version == get_data_version(session):
+            if age <= QUERY_CACHE_TTL_SECONDS:
+                response.headers["X-Cache"] = "HIT"
+                return value
+            if servable:
+                _mark_stale(response, stored_at)
+                if not circuit_breaker.is_open():
+                    _refresh_in_background(key, loader)
+                return value
+        elif servable:
+            if circuit_breaker.is_open():
+                _mark_stale(response, stored_at)
+                return value
+            if not result_cache.claim_refresh(key):
+                # Another request is already reloading this query; use its result
+                result_cache.wait_for_refresh(key, QUERY_CACHE_RELOAD_WAIT_SECONDS)
+                reloaded = result_cache.get(key)
+                if reloaded is not None and reloaded[2] == get_data_version():
+                    response.headers["X-Cache"] = "HIT"
+                    return reloaded[0]
+                _mark_stale(response, stored_at)
+                return value
+            try:
+                return _load(session, response, key, loader)
+            except Exception as e:
+                logger.warning(f"Reload after data change failed, serving stale: {str(e)}")
+                session.rollback()
+                _mark_stale(response, stored_at)
+                return value
+            finally:
+                result_cache.release_refresh(key)
+
+    return _load(session, response, key, loader)
+
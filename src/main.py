@@ -1,11 +1,19 @@
+import anyio
 from fastapi import FastAPI
-from src.database import init_database, create_db_and_tables
-from src.routers import us_covid, ca_covid, ukhsa_vax
+from sqlmodel import Session
+from src import database
+from src.database import init_database, create_db_and_tables, close_database
+from src.dependencies.admission import THREADPOOL_SIZE, admission_controller
+from src.dependencies.dimensions import dimension_index
+from src.dependencies.logger_config import get_logger
+from src.routers import us_covid, ca_covid, ukhsa_vax, dimensions, batch
 
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.staticfiles import StaticFiles
 
 
+logger = get_logger("main")
+
 app = FastAPI(
     title="COVID Data API",
     description="API for COVID-19 data",
@@ -28,6 +36,15 @@ async def custom_swagger_ui_html():
 app.include_router(us_covid.router, prefix="/api/v1", tags=["US COVID Data"])
 app.include_router(ukhsa_vax.router, prefix="/api/v1", tags=["UKHSA COVID Vax Data"])
 app.include_router(ca_covid.router, prefix="/api/v1", tags=["Canada COVID Data"])
+app.include_router(dimensions.router, prefix="/api/v1", tags=["Dimensions"])
+app.include_router(batch.router, prefix="/api/v1", tags=["Batch"])
+
+
+@app.on_event("startup")
+async def size_threadpool():
+    # Blocking Snowflake work runs in anyio's threadpool; make room for every admitted and queued request
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, THREADPOOL_SIZE)
 
 
 @app.on_event("startup")
@@ -36,6 +53,19 @@ def on_startup():
     db_initialized = init_database()
     if db_initialized:
         create_db_and_tables()
+        # Load dropdown/filter values into memory; routes fall back to Snowflake if this fails
+        try:
+            with Session(database.engine) as session:
+                dimension_index.build(session)
+        except Exception as e:
+            logger.error(f"Failed to build dimension index: {str(e)}")
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # In-flight requests were drained by uvicorn before this runs; background
+    # refreshes are drained by close_database
+    close_database()
 
 
 @app.get("/")
@@ -47,6 +77,7 @@ async def root():
             "all_covid_data": "/api/v1/US/",
             "covid_by_jurisdiction": "/api/v1/US/{jurisdiction_residence_name}",
             "covid_by_month": "/api/v1/US/{month_name}/",
+            "death_rate_series": "/api/v1/US/series/?jurisdiction_residence_name=Texas",
             "delete_by_key": "/api/v1/US/key/{covid_deaths_key}",
             "update_by_key": "/api/v1/US/key/{covid_deaths_key}",
             "health": "/health",
@@ -64,9 +95,16 @@ async def root():
             "vaccinations_by_age_category": "/api/v1/UKHSA/{age_category}",
             "health": "/health",
         },
+        "dimension_endpoints": {
+            "list_dimensions": "/api/v1/dimensions/",
+            "dimension_values": "/api/v1/dimensions/{name}?prefix=",
+        },
+        "batch_endpoints": {
+            "batch_read": "POST /api/v1/batch",
+        },
     }
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "database_admission": admission_controller.stats()}
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List, Optional
+from sqlmodel import SQLModel, Field
+
+
+class BatchSubRequest(SQLModel, table=False):
+    id: Optional[str] = Field(default=None, description="Caller-chosen identifier echoed back in the result")
+    route: str = Field(description="Read operation to run, e.g. us_aggregate or ukhsa_dose")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Route parameters, including limit and offset")
+
+
+class BatchRequest(SQLModel, table=False):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(SQLModel, table=False):
+    id: Optional[str] = None
+    route: str
+    status: int = Field(description="HTTP status the equivalent single request would have returned")
+    body: Optional[Any] = None
+    detail: Optional[str] = None
+    cache: Optional[str] = Field(default=None, description="HIT, MISS or STALE")
+
+
+class BatchResponse(SQLModel, table=False):
+    results: List[BatchSubResponse]
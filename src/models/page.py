@@ -0,0 +1,12 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T] = Field(description="Records on this page")
+    total: Optional[int] = Field(default=None, description="Total number of matching records")
+    approximate: bool = Field(default=False, description="Whether total is an estimate from table metadata")
+    limit: int = Field(description="Page size requested")
+    offset: int = Field(description="Offset of the first record on this page")
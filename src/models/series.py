@@ -0,0 +1,21 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class Series(BaseModel):
+    jurisdiction_residence_name: Optional[str] = None
+    demographic_group_name: Optional[str] = None
+    subgroup1_name: Optional[str] = None
+    subgroup2_name: Optional[str] = None
+    metric: str = Field(description="Metric column the values come from")
+    points_total: int = Field(description="Points in the series before downsampling")
+    year: List[int]
+    month_code: List[str]
+    value: List[float]
+
+
+class SeriesResponse(BaseModel):
+    max_points: int = Field(description="Point budget for the whole response")
+    points_per_series: int = Field(description="Share of the budget each series was downsampled to")
+    method: str = Field(description="Downsampling method: lttb or minmax")
+    series: List[Series]
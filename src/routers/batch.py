@@ -0,0 +1,243 @@
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import tuple_
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, func
+
+from src import database
+from src.dependencies.admission import client_rate_limiter
+from src.dependencies.dimensions import NOT_FOUND_DETAILS, dimension_for, require_known
+from src.dependencies.logger_config import get_logger
+from src.dependencies.pagination import page_statement
+from src.dependencies.resilience import cached_query
+from src.models.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from src.models.gold_ca_fact_tables import gold_fact_ca_demand, gold_fact_ca_antibody
+from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+from src.models.gold_fact_ukhsa_vaccinations import gold_fact_ukhsa_vaccinations
+
+logger = get_logger("batch_router")
+
+router = APIRouter()
+
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "100"))
+# Queries from one batch running against Snowflake at once
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# Route name -> (model, {parameter: column it filters on}, 404 detail when no rows match)
+BATCH_ROUTES = {
+    "us_all": (gold_fact_covid_deaths, {}, None),
+    "us_aggregate": (
+        gold_fact_covid_deaths,
+        {
+            "jurisdiction_residence_name": "JURISDICTION_RESIDENCE_NAME",
+            "month_name": "MONTH_NAME",
+        },
+        None,
+    ),
+    "us_jurisdiction": (
+        gold_fact_covid_deaths,
+        {"jurisdiction_residence_name": "JURISDICTION_RESIDENCE_NAME"},
+        NOT_FOUND_DETAILS["us_jurisdictions"],
+    ),
+    "us_month": (gold_fact_covid_deaths, {"month_name": "MONTH_NAME"}, None),
+    "ukhsa_all": (gold_fact_ukhsa_vaccinations, {}, None),
+    "ukhsa_aggregate": (
+        gold_fact_ukhsa_vaccinations,
+        {
+            "date": "DATE",
+            "area_name": "AREA_NAME",
+            "age_category": "AGE_CATEGORY",
+            "dose_type": "DOSE_LABEL",
+        },
+        None,
+    ),
+    "ukhsa_area": (
+        gold_fact_ukhsa_vaccinations,
+        {"area_name": "AREA_NAME"},
+        NOT_FOUND_DETAILS["ukhsa_areas"],
+    ),
+    "ukhsa_date": (gold_fact_ukhsa_vaccinations, {"date": "DATE"}, None),
+    "ukhsa_age_category": (
+        gold_fact_ukhsa_vaccinations,
+        {"age_category": "AGE_CATEGORY"},
+        None,
+    ),
+    "ukhsa_dose": (gold_fact_ukhsa_vaccinations, {"dose_type": "DOSE_LABEL"}, None),
+    "ca_demand": (gold_fact_ca_demand, {}, None),
+    "ca_antibody": (gold_fact_ca_antibody, {}, None),
+}
+
+
+def _parse(sub: BatchSubRequest) -> Tuple[Tuple[str, ...], int, int]:
+    """Validate a sub-request and return its filter values, limit and offset"""
+    if sub.route not in BATCH_ROUTES:
+        raise HTTPException(status_code=404, detail=f"Unknown batch route: {sub.route}")
+    model, params, _ = BATCH_ROUTES[sub.route]
+
+    missing = [param for param in params if param not in sub.params]
+    if missing:
+        raise HTTPException(
+            status_code=422, detail=f"Missing parameters: {', '.join(missing)}"
+        )
+    try:
+        limit = int(sub.params.get("limit", 100))
+        offset = int(sub.params.get("offset", 0))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="limit and offset must be integers")
+
+    values = []
+    for param, column in params.items():
+        value = str(sub.params[param])
+        dimension = dimension_for(model, column)
+        if dimension is not None:
+            require_known(dimension, value)
+        values.append(value)
+    return tuple(values), limit, offset
+
+
+def _single_statement(model, columns: List[str], values: Tuple[str, ...], limit: int, offset: int):
+    # Same statement the single-request routes build, so they share cache entries
+    return page_statement(model, dict(zip(columns, values)), limit, offset)
+
+
+def _merged_statement(
+    model, columns: List[str], value_sets: List[Tuple[str, ...]], limit: int, offset: int
+):
+    """
+    One query answering several sub-requests that differ only in filter values.
+    Rows are numbered per filter combination in primary key order, the same order
+    page_statement uses, and each combination keeps the rows in its own
+    limit/offset window.
+    """
+    partition = [getattr(model, column) for column in columns]
+    if len(partition) == 1:
+        match = partition[0].in_([values[0] for values in value_sets])
+    else:
+        match = tuple_(*partition).in_(value_sets)
+    row_number = (
+        func.row_number()
+        .over(partition_by=partition, order_by=list(model.__table__.primary_key.columns))
+        .label("BATCH_ROW_NUMBER")
+    )
+    ranked = select(model, row_number).where(match).subquery()
+    entity = aliased(model, ranked)
+    return (
+        select(entity)
+        .where(
+            ranked.c.BATCH_ROW_NUMBER > offset,
+            ranked.c.BATCH_ROW_NUMBER <= offset + limit,
+        )
+        .order_by(ranked.c.BATCH_ROW_NUMBER)
+    )
+
+
+def _execute(statement) -> Tuple[List[Any], Optional[str]]:
+    """Run one statement on its own session through the result cache"""
+    if database.engine is None:
+        raise Exception(
+            "Database not initialized. Please set up your .env file with Snowflake credentials."
+        )
+    response = Response()
+    with Session(database.engine) as session:
+        rows = cached_query(session, response, statement)
+    return rows, response.headers.get("X-Cache")
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, request: Request):
+    """Run many read sub-requests in one round trip, merging queries where possible"""
+    if database.engine is None:
+        raise Exception(
+            "Database not initialized. Please set up your .env file with Snowflake credentials."
+        )
+    max_requests = BATCH_MAX_REQUESTS
+    if client_rate_limiter.rate > 0:
+        # A larger batch could never be paid for out of one client's bucket
+        max_requests = min(max_requests, int(client_rate_limiter.burst))
+    if len(batch.requests) > max_requests:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {max_requests} requests",
+        )
+    # Each sub-request costs what the equivalent single request would
+    client_rate_limiter.check(
+        request.client.host if request.client else "unknown",
+        cost=max(1, len(batch.requests)),
+    )
+
+    results: List[Optional[BatchSubResponse]] = [None] * len(batch.requests)
+
+    # (route, limit, offset) -> filter values -> indexes of the sub-requests asking for them
+    groups: "OrderedDict[Tuple[str, int, int], OrderedDict[Tuple[str, ...], List[int]]]" = OrderedDict()
+    for i, sub in enumerate(batch.requests):
+        try:
+            values, limit, offset = _parse(sub)
+        except HTTPException as e:
+            results[i] = BatchSubResponse(
+                id=sub.id, route=sub.route, status=e.status_code, detail=str(e.detail)
+            )
+            continue
+        groups.setdefault((sub.route, limit, offset), OrderedDict()).setdefault(
+            values, []
+        ).append(i)
+
+    # Each unit is (route, statement, columns to split merged rows by, values -> indexes)
+    units = []
+    for (route, limit, offset), by_values in groups.items():
+        model, params, _ = BATCH_ROUTES[route]
+        columns = list(params.values())
+        if columns and len(by_values) > 1:
+            statement = _merged_statement(model, columns, list(by_values), limit, offset)
+            units.append((route, statement, columns, by_values))
+        else:
+            for values, indexes in by_values.items():
+                statement = _single_statement(model, columns, values, limit, offset)
+                units.append((route, statement, None, {values: indexes}))
+
+    logger.info(f"/batch requests={len(batch.requests)} queries={len(units)}")
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    def fill(indexes: List[int], **fields):
+        for i in indexes:
+            sub = batch.requests[i]
+            results[i] = BatchSubResponse(id=sub.id, route=sub.route, **fields)
+
+    async def run(route: str, statement, columns: Optional[List[str]], by_values: Dict):
+        async with semaphore:
+            try:
+                rows, cache = await run_in_threadpool(_execute, statement)
+            except HTTPException as e:
+                for indexes in by_values.values():
+                    fill(indexes, status=e.status_code, detail=str(e.detail))
+                return
+            except Exception as e:
+                logger.error(f"/batch {route} error: {type(e).__name__}: {e}", exc_info=True)
+                for indexes in by_values.values():
+                    fill(indexes, status=500, detail=f"Error fetching COVID-19 data: {str(e)}")
+                return
+
+        if columns is None:
+            grouped = {values: rows for values in by_values}
+        else:
+            grouped = {}
+            for row in rows:
+                key = tuple(str(getattr(row, column)) for column in columns)
+                grouped.setdefault(key, []).append(row)
+
+        not_found_detail = BATCH_ROUTES[route][2]
+        for values, indexes in by_values.items():
+            matched = grouped.get(values, [])
+            if not matched and not_found_detail:
+                fill(indexes, status=404, detail=not_found_detail, cache=cache)
+            else:
+                fill(indexes, status=200, body=jsonable_encoder(matched), cache=cache)
+
+    await asyncio.gather(*(run(*unit) for unit in units))
+    return BatchResponse(results=results)
@@ -1,5 +1,5 @@
 from sqlalchemy import desc
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Response
 from sqlmodel import Session, select, col, func
 from typing import List
 from src.database import get_session
@@ -10,6 +10,8 @@ from src.models.gold_ca_fact_tables import (
     antibody_by_age_group,
 )
 from src.dependencies.logger_config import get_logger
+from src.dependencies.pagination import page_statement
+from src.dependencies.resilience import cached_query
 
 
 logger = get_logger("covid_router")
@@ -18,14 +20,19 @@ router = APIRouter()
 
 
 @router.get("/ca/demand/", response_model=List[gold_fact_ca_demand])
-async def get_ca_demand_data(
-    limit: int = 100, offset: int = 0, session: Session = Depends(get_session)
+def get_ca_demand_data(
+    response: Response,
+    limit: int = 100,
+    offset: int = 0,
+    session: Session = Depends(get_session),
 ):
     """Get paginated Canada COVID-19 test kit demand data from gold_fact_ca_demand table"""
     try:
-        statement = select(gold_fact_ca_demand).offset(offset).limit(limit)
-        ca_data = session.exec(statement).all()
+        statement = page_statement(gold_fact_ca_demand, {}, limit, offset)
+        ca_data = cached_query(session, response, statement)
         return ca_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching Canada COVID-19 data: {str(e)}")
         raise HTTPException(
@@ -34,8 +41,11 @@ async def get_ca_demand_data(
 
 
 @router.get("/ca/demand/onsite_test_usage/", response_model=List[on_site_test_usage])
-async def get_ca_onsite_usage(
-    limit: int = 100, offset: int = 0, session: Session = Depends(get_session)
+def get_ca_onsite_usage(
+    response: Response,
+    limit: int = 100,
+    offset: int = 0,
+    session: Session = Depends(get_session),
 ):
     """Get paginated Canada COVID-19 on-site test kit usage by region and industry"""
     try:
@@ -66,8 +76,10 @@ async def get_ca_onsite_usage(
             .limit(limit)
         )
 
-        results = session.exec(statement).all()
+        results = cached_query(session, response, statement)
         return results
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching Canada COVID-19 data: {str(e)}")
         raise HTTPException(
@@ -76,14 +88,19 @@ async def get_ca_onsite_usage(
 
 
 @router.get("/ca/antibody/", response_model=List[gold_fact_ca_antibody])
-async def get_ca_antibody_data(
-    limit: int = 100, offset: int = 0, session: Session = Depends(get_session)
+def get_ca_antibody_data(
+    response: Response,
+    limit: int = 100,
+    offset: int = 0,
+    session: Session = Depends(get_session),
 ):
     """Get paginated Canada COVID-19 antibody data from gold_fact_ca_antibody table"""
     try:
-        statement = select(gold_fact_ca_antibody).offset(offset).limit(limit)
-        ca_data = session.exec(statement).all()
+        statement = page_statement(gold_fact_ca_antibody, {}, limit, offset)
+        ca_data = cached_query(session, response, statement)
         return ca_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching Canada COVID-19 data: {str(e)}")
         raise HTTPException(
@@ -92,8 +109,11 @@ async def get_ca_antibody_data(
 
 
 @router.get("/ca/antibody/age_group/", response_model=List[antibody_by_age_group])
-async def get_ca_antibody_by_age_group(
-    limit: int = 100, offset: int = 0, session: Session = Depends(get_session)
+def get_ca_antibody_by_age_group(
+    response: Response,
+    limit: int = 100,
+    offset: int = 0,
+    session: Session = Depends(get_session),
 ):
     """Get paginated Canada COVID-19 antibody data by age group"""
     try:
@@ -124,8 +144,10 @@ async def get_ca_antibody_by_age_group(
             .offset(offset)
             .limit(limit)
         )
-        results = session.exec(statement).all()
+        results = cached_query(session, response, statement)
         return results
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching Canada COVID-19 data: {str(e)}")
         raise HTTPException(
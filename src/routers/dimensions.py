@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import Session
+from typing import Optional
+from src import database
+from src.dependencies.dimensions import DIMENSIONS, dimension_index
+from src.dependencies.logger_config import get_logger
+
+logger = get_logger("dimensions_router")
+
+router = APIRouter()
+
+
+def _ensure_index():
+    # Served from memory; Snowflake is only queried while the index has never loaded
+    try:
+        if dimension_index.loaded:
+            dimension_index.refresh()
+            return
+        if database.engine is None:
+            raise Exception(
+                "Database not initialized. Please set up your .env file with Snowflake credentials."
+            )
+        with Session(database.engine) as session:
+            dimension_index.build(session)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building dimension index: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error building dimension index: {str(e)}"
+        )
+
+
+@router.get("/dimensions/")
+def list_dimensions():
+    """List the available dimensions and how many distinct values each holds"""
+    _ensure_index()
+    return {
+        name: len(dimension_index.get(name)) for name in dimension_index.names()
+    }
+
+
+@router.get("/dimensions/{name}")
+def get_dimension_values(
+    name: str,
+    prefix: str = "",
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """Get the distinct values of a dimension, optionally filtered by a case-insensitive prefix"""
+    if name not in DIMENSIONS:
+        raise HTTPException(status_code=404, detail="Unknown dimension")
+    _ensure_index()
+    dimension = dimension_index.get(name)
+    if dimension is None:
+        raise HTTPException(status_code=503, detail=f"Dimension {name} is not available")
+    values = dimension.search(prefix, limit)
+    return {"name": name, "prefix": prefix, "count": len(values), "values": values}
@@ -1,133 +1,174 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
 from sqlmodel import Session, select, col, func
-from typing import List
+from typing import List, Union
 from src.database import get_session
 from src.models.gold_fact_ukhsa_vaccinations import gold_fact_ukhsa_vaccinations
+from src.models.page import Page
+from src.dependencies.dimensions import NOT_FOUND_DETAILS, require_known
 from src.dependencies.logger_config import get_logger
+from src.dependencies.pagination import paginate
+
+UKHSAResponse = Union[List[gold_fact_ukhsa_vaccinations], Page[gold_fact_ukhsa_vaccinations]]
 
 logger = get_logger("covid_router")
 
 router = APIRouter()
 
-@router.get("/UKHSA/", response_model=List[gold_fact_ukhsa_vaccinations])
-async def get_ukhsa_data(
+@router.get("/UKHSA/", response_model=UKHSAResponse)
+def get_ukhsa_data(
+    request: Request,
+    response: Response,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
+    approximate_count: bool = False,
     session: Session = Depends(get_session)
 ):
     """Get paginated UKHSA COVID-19 vaccination data from gold_fact_ukhsa_vaccinations"""
     try:
-        statement = select(gold_fact_ukhsa_vaccinations).offset(offset).limit(limit)
-        ukhsa_data = session.exec(statement).all()
-        return ukhsa_data
+        return paginate(
+            session, request, response, gold_fact_ukhsa_vaccinations, {}, limit, offset,
+            envelope=envelope, approximate=approximate_count
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
 
 # Return all records matching jurisdiction and month, with pagination
-@router.get("/UKHSA/aggregate/", response_model=List[gold_fact_ukhsa_vaccinations])
-async def get_by_area_name_and_date(
+@router.get("/UKHSA/aggregate/", response_model=UKHSAResponse)
+def get_by_area_name_and_date(
+    request: Request,
+    response: Response,
     date: str,
     area_name: str,
     age_category: str,
     dose_type: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session)
 ):
     """Return all records matching area_name and date, paginated."""
     try:
         logger.info(f"/UKHSA/aggregate/ params: area_name='{area_name}', date='{date}', limit={limit}, offset={offset}")
-        stmt = (
-            select(gold_fact_ukhsa_vaccinations)
-            .where(
-                (gold_fact_ukhsa_vaccinations.DATE == date) &
-                (gold_fact_ukhsa_vaccinations.AREA_NAME == area_name) &
-                (gold_fact_ukhsa_vaccinations.AGE_CATEGORY == age_category) &
-                (gold_fact_ukhsa_vaccinations.DOSE_LABEL == dose_type)
-            )
-            .offset(offset)
-            .limit(limit)
+        require_known("ukhsa_areas", area_name)
+        require_known("ukhsa_age_categories", age_category)
+        require_known("ukhsa_dose_labels", dose_type)
+        results = paginate(
+            session, request, response, gold_fact_ukhsa_vaccinations,
+            {
+                "DATE": date,
+                "AREA_NAME": area_name,
+                "AGE_CATEGORY": age_category,
+                "DOSE_LABEL": dose_type,
+            },
+            limit, offset, envelope=envelope
         )
-        results = session.exec(stmt).all()
-        logger.info(f"/UKHSA/aggregate/ results_count={len(results)}")
+        logger.info(f"/UKHSA/aggregate/ results_count={len(results.items if envelope else results)}")
         return results
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"/UKHSA/aggregate/ error: {type(e).__name__}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching COVID-19 vaccination data: {str(e)}")
 
-@router.get("/UKHSA/area/{area_name}", response_model=List[gold_fact_ukhsa_vaccinations])
-async def get_ukhsa_by_area_name(
+@router.get("/UKHSA/area/{area_name}", response_model=UKHSAResponse)
+def get_ukhsa_by_area_name(
+    request: Request,
+    response: Response,
     area_name: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session)
 ):
     """Get all US COVID-19 data by area name, paginated"""
     try:
+        require_known("ukhsa_areas", area_name)
         # Get all records matching the jurisdiction name, with pagination
-        statement = select(gold_fact_ukhsa_vaccinations).where(
-            gold_fact_ukhsa_vaccinations.AREA_NAME == area_name
-        ).offset(offset).limit(limit)
-        ukhsa_data = session.exec(statement).all()
-        if not ukhsa_data:
+        ukhsa_data = paginate(
+            session, request, response, gold_fact_ukhsa_vaccinations,
+            {"AREA_NAME": area_name}, limit, offset, envelope=envelope
+        )
+        if not (ukhsa_data.items if envelope else ukhsa_data):
             logger.info(f"No data found for area name: {area_name}")
-            raise HTTPException(status_code=404, detail="No data found for area name")
+            raise HTTPException(status_code=404, detail=NOT_FOUND_DETAILS["ukhsa_areas"])
         return ukhsa_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
 
-@router.get("/UKHSA/date/{date}", response_model=List[gold_fact_ukhsa_vaccinations])
-async def get_ukhsa_by_date(
+@router.get("/UKHSA/date/{date}", response_model=UKHSAResponse)
+def get_ukhsa_by_date(
+    request: Request,
+    response: Response,
     date: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session)
 ):
     """Get paginated US COVID-19 data for a specific date"""
     try:
-        statement = select(gold_fact_ukhsa_vaccinations).where(
-            gold_fact_ukhsa_vaccinations.DATE == date
-        ).offset(offset).limit(limit)
-        ukhsa_data = session.exec(statement).all()
+        ukhsa_data = paginate(
+            session, request, response, gold_fact_ukhsa_vaccinations,
+            {"DATE": date}, limit, offset, envelope=envelope
+        )
         return ukhsa_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
     
-@router.get("/UKHSA/age_category/{age_category}", response_model=List[gold_fact_ukhsa_vaccinations])
-async def get_ukhsa_by_age_category(
+@router.get("/UKHSA/age_category/{age_category}", response_model=UKHSAResponse)
+def get_ukhsa_by_age_category(
+    request: Request,
+    response: Response,
     age_category: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session)
 ):
     """Get paginated US COVID-19 data for a specific age category"""
     try:
-        statement = select(gold_fact_ukhsa_vaccinations).where(
-            gold_fact_ukhsa_vaccinations.AGE_CATEGORY == age_category
-        ).offset(offset).limit(limit)
-        ukhsa_data = session.exec(statement).all()
+        require_known("ukhsa_age_categories", age_category)
+        ukhsa_data = paginate(
+            session, request, response, gold_fact_ukhsa_vaccinations,
+            {"AGE_CATEGORY": age_category}, limit, offset, envelope=envelope
+        )
         return ukhsa_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
     
-@router.get("/UKHSA/dose/{dose_type}", response_model=List[gold_fact_ukhsa_vaccinations])
-async def get_ukhsa_by_dose_type(
+@router.get("/UKHSA/dose/{dose_type}", response_model=UKHSAResponse)
+def get_ukhsa_by_dose_type(
+    request: Request,
+    response: Response,
     dose_type: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session)
 ):
     """Get paginated US COVID-19 data for a specific age category"""
     try:
-        statement = select(gold_fact_ukhsa_vaccinations).where(
-            gold_fact_ukhsa_vaccinations.DOSE_LABEL == dose_type
-        ).offset(offset).limit(limit)
-        ukhsa_data = session.exec(statement).all()
+        require_known("ukhsa_dose_labels", dose_type)
+        ukhsa_data = paginate(
+            session, request, response, gold_fact_ukhsa_vaccinations,
+            {"DOSE_LABEL": dose_type}, limit, offset, envelope=envelope
+        )
         return ukhsa_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching UKHSA COVID-19 vaccination data: {str(e)}")
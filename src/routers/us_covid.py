@@ -1,24 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+import numpy as np
+from sqlalchemy import Integer, cast
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
 from sqlmodel import Session, select, col, func
-from typing import List
-from src.database import get_session
+from typing import List, Optional, Union
+from src.database import get_admitted_session, get_session
 from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+from src.models.page import Page
+from src.models.series import SeriesResponse
+from src.dependencies.data_version import bump_data_version
+from src.dependencies.dimensions import NOT_FOUND_DETAILS, require_known
+from src.dependencies.downsampling import downsample
 from src.dependencies.logger_config import get_logger
+from src.dependencies.pagination import paginate
+from src.dependencies.resilience import cached_query
 
 logger = get_logger("covid_router")
 
 router = APIRouter()
 
 
-@router.get("/US/", response_model=List[gold_fact_covid_deaths])
-async def get_us_data(
-    limit: int = 100, offset: int = 0, session: Session = Depends(get_session)
+@router.get(
+    "/US/",
+    response_model=Union[List[gold_fact_covid_deaths], Page[gold_fact_covid_deaths]],
+)
+def get_us_data(
+    request: Request,
+    response: Response,
+    limit: int = 100,
+    offset: int = 0,
+    envelope: bool = False,
+    approximate_count: bool = False,
+    session: Session = Depends(get_session),
 ):
     """Get paginated US COVID-19 data from gold_fact_covid_deaths"""
     try:
-        statement = select(gold_fact_covid_deaths).offset(offset).limit(limit)
-        us_data = session.exec(statement).all()
-        return us_data
+        return paginate(
+            session,
+            request,
+            response,
+            gold_fact_covid_deaths,
+            {},
+            limit,
+            offset,
+            envelope=envelope,
+            approximate=approximate_count,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching US COVID-19 data: {str(e)}")
         raise HTTPException(
@@ -27,12 +55,18 @@ async def get_us_data(
 
 
 # Return all records matching jurisdiction and month, with pagination
-@router.get("/US/aggregate/", response_model=List[gold_fact_covid_deaths])
-async def get_by_jurisdiction_and_month(
+@router.get(
+    "/US/aggregate/",
+    response_model=Union[List[gold_fact_covid_deaths], Page[gold_fact_covid_deaths]],
+)
+def get_by_jurisdiction_and_month(
+    request: Request,
+    response: Response,
     jurisdiction_residence_name: str,
     month_name: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session),
 ):
     """Return all records matching jurisdiction and month, paginated."""
@@ -40,21 +74,27 @@ async def get_by_jurisdiction_and_month(
         logger.info(
             f"/US/aggregate/ params: jurisdiction_residence_name='{jurisdiction_residence_name}', month_name='{month_name}', limit={limit}, offset={offset}"
         )
-        stmt = (
-            select(gold_fact_covid_deaths)
-            .where(
-                (
-                    gold_fact_covid_deaths.JURISDICTION_RESIDENCE_NAME
-                    == jurisdiction_residence_name
-                )
-                & (gold_fact_covid_deaths.MONTH_NAME == month_name)
-            )
-            .offset(offset)
-            .limit(limit)
+        require_known("us_jurisdictions", jurisdiction_residence_name)
+        require_known("us_months", month_name)
+        results = paginate(
+            session,
+            request,
+            response,
+            gold_fact_covid_deaths,
+            {
+                "JURISDICTION_RESIDENCE_NAME": jurisdiction_residence_name,
+                "MONTH_NAME": month_name,
+            },
+            limit,
+            offset,
+            envelope=envelope,
+        )
+        logger.info(
+            f"/US/aggregate/ results_count={len(results.items if envelope else results)}"
         )
-        results = session.exec(stmt).all()
-        logger.info(f"/US/aggregate/ results_count={len(results)}")
         return results
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"/US/aggregate/ error: {type(e).__name__}: {e}", exc_info=True)
         raise HTTPException(
@@ -62,36 +102,191 @@ async def get_by_jurisdiction_and_month(
         )
 
 
+SERIES_METRICS = ("COVID_DEATHS", "CRUDE_COVID_RATE", "AA_COVID_RATE")
+SERIES_KEYS = (
+    "JURISDICTION_RESIDENCE_NAME",
+    "DEMOGRAPHIC_GROUP_NAME",
+    "SUBGROUP1_NAME",
+    "SUBGROUP2_NAME",
+)
+
+
+# Declared before /US/{jurisdiction_residence_name} and /US/{month_name}/ so "series" isn't taken as a name
+@router.get("/US/series/", response_model=SeriesResponse)
+def get_us_series(
+    response: Response,
+    max_points: int = Query(1000, ge=3, le=10000),
+    metrics: List[str] = Query(list(SERIES_METRICS)),
+    method: str = Query("lttb", pattern="^(lttb|minmax)$"),
+    jurisdiction_residence_name: Optional[str] = None,
+    demographic_group_name: Optional[str] = None,
+    subgroup1_name: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """Get monthly death and rate series, downsampled to max_points points in total"""
+    try:
+        metrics = list(dict.fromkeys(metrics))
+        unknown = [metric for metric in metrics if metric not in SERIES_METRICS]
+        if unknown:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown metrics: {', '.join(unknown)}"
+            )
+
+        filters = {}
+        if jurisdiction_residence_name is not None:
+            require_known("us_jurisdictions", jurisdiction_residence_name)
+            filters["JURISDICTION_RESIDENCE_NAME"] = jurisdiction_residence_name
+        if demographic_group_name is not None:
+            require_known("us_demographic_groups", demographic_group_name)
+            filters["DEMOGRAPHIC_GROUP_NAME"] = demographic_group_name
+        if subgroup1_name is not None:
+            require_known("us_subgroups", subgroup1_name)
+            filters["SUBGROUP1_NAME"] = subgroup1_name
+
+        key_columns = [getattr(gold_fact_covid_deaths, key) for key in SERIES_KEYS]
+        conditions = [
+            gold_fact_covid_deaths.YEAR.is_not(None),
+            gold_fact_covid_deaths.MONTH_CODE.is_not(None),
+            *[
+                getattr(gold_fact_covid_deaths, column) == value
+                for column, value in filters.items()
+            ],
+        ]
+
+        series_keys = select(*key_columns).where(*conditions).distinct().subquery()
+        n_keys = cached_query(
+            session, response, select(func.count()).select_from(series_keys)
+        )[0]
+        n_series = n_keys * len(metrics)
+        points_per_series = max_points // n_series if n_series else max_points
+        if points_per_series < 3:
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    f"{n_series} series match but max_points={max_points} covers at "
+                    f"most {max_points // 3} at 3 points each. Filter by jurisdiction, "
+                    "demographic group or subgroup, request fewer metrics, or raise "
+                    "max_points."
+                ),
+            )
+
+        # MONTH_CODE is text, so it is cast to sort months numerically
+        month_number = cast(gold_fact_covid_deaths.MONTH_CODE, Integer).label(
+            "MONTH_NUMBER"
+        )
+        statement = (
+            select(
+                *key_columns,
+                gold_fact_covid_deaths.YEAR,
+                gold_fact_covid_deaths.MONTH_CODE,
+                month_number,
+                *[getattr(gold_fact_covid_deaths, metric) for metric in metrics],
+            )
+            .where(*conditions)
+            .order_by(*key_columns, gold_fact_covid_deaths.YEAR, month_number)
+        )
+        rows = cached_query(session, response, statement)
+
+        series = []
+        if rows:
+            columns = list(zip(*rows))
+            keys = [
+                np.asarray(column, dtype=object)
+                for column in columns[: len(SERIES_KEYS)]
+            ]
+            years = np.asarray(columns[len(SERIES_KEYS)], dtype=object)
+            month_codes = np.asarray(columns[len(SERIES_KEYS) + 1], dtype=object)
+            # Months since year 0, so gaps in the data stay gaps on the x axis
+            months = (
+                np.asarray(columns[len(SERIES_KEYS)], dtype=float) * 12
+                + np.asarray(columns[len(SERIES_KEYS) + 2], dtype=float)
+            )
+            values = {
+                metric: np.asarray(columns[len(SERIES_KEYS) + 3 + i], dtype=float)
+                for i, metric in enumerate(metrics)
+            }
+
+            # Rows are ordered by series key, so each series is a contiguous run
+            changed = np.zeros(len(rows) - 1, dtype=bool)
+            for key in keys:
+                changed |= key[1:] != key[:-1]
+            bounds = np.concatenate(([0], np.flatnonzero(changed) + 1, [len(rows)]))
+
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                x = months[start:end]
+                for metric in metrics:
+                    y = values[metric][start:end]
+                    kept = downsample(x, y, points_per_series, method) + start
+                    series.append(
+                        {
+                            **{
+                                key.lower(): keys[i][start]
+                                for i, key in enumerate(SERIES_KEYS)
+                            },
+                            "metric": metric,
+                            "points_total": int(np.count_nonzero(~np.isnan(y))),
+                            "year": years[kept].tolist(),
+                            "month_code": month_codes[kept].tolist(),
+                            "value": values[metric][kept].tolist(),
+                        }
+                    )
+
+        logger.info(
+            f"/US/series/ rows={len(rows)} series={len(series)} "
+            f"max_points={max_points} points_per_series={points_per_series}"
+        )
+        return {
+            "max_points": max_points,
+            "points_per_series": points_per_series,
+            "method": method,
+            "series": series,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"/US/series/ error: {type(e).__name__}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching US COVID-19 series: {str(e)}"
+        )
+
+
 @router.get(
-    "/US/{jurisdiction_residence_name}", response_model=List[gold_fact_covid_deaths]
+    "/US/{jurisdiction_residence_name}",
+    response_model=Union[List[gold_fact_covid_deaths], Page[gold_fact_covid_deaths]],
 )
-async def get_us_by_jurisdiction(
+def get_us_by_jurisdiction(
+    request: Request,
+    response: Response,
     jurisdiction_residence_name: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session),
 ):
     """Get all US COVID-19 data by jurisdiction residence name, paginated"""
     try:
+        require_known("us_jurisdictions", jurisdiction_residence_name)
         # Get all records matching the jurisdiction name, with pagination
-        statement = (
-            select(gold_fact_covid_deaths)
-            .where(
-                gold_fact_covid_deaths.JURISDICTION_RESIDENCE_NAME
-                == jurisdiction_residence_name
-            )
-            .offset(offset)
-            .limit(limit)
+        us_data = paginate(
+            session,
+            request,
+            response,
+            gold_fact_covid_deaths,
+            {"JURISDICTION_RESIDENCE_NAME": jurisdiction_residence_name},
+            limit,
+            offset,
+            envelope=envelope,
         )
-        us_data = session.exec(statement).all()
-        if not us_data:
+        if not (us_data.items if envelope else us_data):
             logger.info(
                 f"No data found for jurisdiction name: {jurisdiction_residence_name}"
             )
             raise HTTPException(
-                status_code=404, detail="No data found for jurisdiction name"
+                status_code=404, detail=NOT_FOUND_DETAILS["us_jurisdictions"]
             )
         return us_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching US COVID-19 data: {str(e)}")
         raise HTTPException(
@@ -99,23 +294,34 @@ async def get_us_by_jurisdiction(
         )
 
 
-@router.get("/US/{month_name}/", response_model=List[gold_fact_covid_deaths])
-async def get_us_data_by_month(
+@router.get(
+    "/US/{month_name}/",
+    response_model=Union[List[gold_fact_covid_deaths], Page[gold_fact_covid_deaths]],
+)
+def get_us_data_by_month(
+    request: Request,
+    response: Response,
     month_name: str,
     limit: int = 100,
     offset: int = 0,
+    envelope: bool = False,
     session: Session = Depends(get_session),
 ):
     """Get paginated US COVID-19 data for a specific month"""
     try:
-        statement = (
-            select(gold_fact_covid_deaths)
-            .where(gold_fact_covid_deaths.MONTH_NAME == month_name)
-            .offset(offset)
-            .limit(limit)
+        require_known("us_months", month_name)
+        return paginate(
+            session,
+            request,
+            response,
+            gold_fact_covid_deaths,
+            {"MONTH_NAME": month_name},
+            limit,
+            offset,
+            envelope=envelope,
         )
-        us_data = session.exec(statement).all()
-        return us_data
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching US COVID-19 data: {str(e)}")
         raise HTTPException(
@@ -124,8 +330,8 @@ async def get_us_data_by_month(
 
 
 @router.delete("/US/key/{covid_deaths_key}", status_code=204)
-async def delete_us_record(
-    covid_deaths_key: int, session: Session = Depends(get_session)
+def delete_us_record(
+    covid_deaths_key: int, session: Session = Depends(get_admitted_session)
 ):
     """Delete a US COVID-19 record by COVID_DEATHS_KEY"""
     try:
@@ -134,16 +340,19 @@ async def delete_us_record(
             raise HTTPException(status_code=404, detail="Record not found")
         session.delete(record)
         session.commit()
+        bump_data_version()
         return
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting record: {str(e)}")
 
 
 @router.put("/US/key/{covid_deaths_key}", response_model=gold_fact_covid_deaths)
-async def update_us_record(
+def update_us_record(
     covid_deaths_key: int,
     updated: gold_fact_covid_deaths = Body(...),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_admitted_session),
 ):
     """Update a US COVID-19 record by COVID_DEATHS_KEY"""
     try:
@@ -155,7 +364,10 @@ async def update_us_record(
             setattr(db_record, key, value)
         session.add(db_record)
         session.commit()
+        bump_data_version()
         session.refresh(db_record)
         return db_record
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating record: {str(e)}")
@@ -0,0 +1,67 @@
+"""
+Production server entry point.
+
+Run with `python -m src.serve` from the repository root. Settings come from
+environment variables (see below) so deployments don't hand-roll uvicorn flags.
+"""
+import importlib.util
+import os
+
+import uvicorn
+
+from src.dependencies.background import GRACEFUL_SHUTDOWN_SECONDS
+from src.dependencies.logger_config import get_logger
+
+logger = get_logger("serve")
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Seconds to keep idle connections open; above common load balancer idle timeouts (60s)
+KEEP_ALIVE_SECONDS = int(os.getenv("KEEP_ALIVE_SECONDS", "75"))
+# Pending connections the OS queues per listening socket
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+ACCESS_LOG = os.getenv("ACCESS_LOG", "false").lower() == "true"
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def available_cores() -> int:
+    """Number of CPU cores this process may run on (respects affinity/cgroup pinning)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", str(available_cores())))
+
+
+def main():
+    """Start uvicorn with one worker process per available core"""
+    workers = default_workers()
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(
+        f"Starting server on {HOST}:{PORT} with workers={workers}, loop={loop}, http={http}"
+    )
+
+    # The app is passed as an import string so every worker process imports it
+    # itself; the Snowflake engine is then created by each worker's startup hook
+    # rather than shared across forked processes.
+    uvicorn.run(
+        "src.main:app",
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=BACKLOG,
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+        access_log=ACCESS_LOG,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    main()
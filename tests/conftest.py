@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel
+
+from src import database
+from src.dependencies import data_version
+from src.dependencies.resilience import result_cache
+from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+from src.models.gold_fact_ukhsa_vaccinations import gold_fact_ukhsa_vaccinations
+
+JURISDICTIONS = ["Texas", "Ohio", "Maine"]
+AREAS = ["London", "Leeds"]
+AGES = ["18+", "65+"]
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            gold_fact_covid_deaths.__table__,
+            gold_fact_ukhsa_vaccinations.__table__,
+        ],
+    )
+    with Session(engine) as session:
+        # Keys are inserted out of order so a missing ORDER BY would show up
+        for key in range(30, 0, -1):
+            session.add(
+                gold_fact_covid_deaths(
+                    COVID_DEATHS_KEY=key,
+                    JURISDICTION_RESIDENCE_NAME=JURISDICTIONS[key % 3],
+                    MONTH_NAME=f"M{key % 4}",
+                    MONTH_CODE=str(key % 4),
+                )
+            )
+        for i in range(40, 0, -1):
+            session.add(
+                gold_fact_ukhsa_vaccinations(
+                    ID=i,
+                    AREA_NAME=AREAS[i % 2],
+                    AGE_CATEGORY=AGES[(i // 2) % 2],
+                    DOSE_LABEL="first",
+                    DATE="2021-01-01",
+                )
+            )
+        session.commit()
+    monkeypatch.setattr(data_version, "DATA_VERSION_FILE", str(tmp_path / "data_version"))
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", engine)
+    result_cache.clear()
+    yield engine
+    result_cache.clear()
+    engine.dispose()
@@ -0,0 +1,34 @@
+import threading
+import time
+
+from src.dependencies.background import BackgroundTasks
+
+
+def test_stop_waits_for_running_tasks():
+    tasks = BackgroundTasks()
+    finished = threading.Event()
+
+    def work():
+        time.sleep(0.2)
+        finished.set()
+
+    assert tasks.start(work)
+    assert tasks.stop(timeout=5) == 0
+    assert finished.is_set()
+
+
+def test_stop_reports_tasks_past_the_timeout():
+    tasks = BackgroundTasks()
+    release = threading.Event()
+    tasks.start(lambda: release.wait(5))
+    assert tasks.stop(timeout=0.05) == 1
+    release.set()
+
+
+def test_no_new_tasks_after_stop():
+    tasks = BackgroundTasks()
+    tasks.stop(timeout=0)
+    ran = []
+    assert not tasks.start(lambda: ran.append(1))
+    time.sleep(0.05)
+    assert ran == []
@@ -0,0 +1,126 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.dependencies import dimensions
+from src.dependencies.admission import client_rate_limiter
+from src.dependencies.dimensions import DimensionIndex
+from src.dependencies.resilience import result_cache
+from src.main import app
+from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+from src.models.gold_fact_ukhsa_vaccinations import gold_fact_ukhsa_vaccinations
+from src.routers.batch import _merged_statement, _single_statement
+
+
+def _split(rows, columns):
+    grouped = {}
+    for row in rows:
+        key = tuple(str(getattr(row, column)) for column in columns)
+        grouped.setdefault(key, []).append(row.model_dump())
+    return grouped
+
+
+@pytest.mark.parametrize(
+    "model, columns, value_sets",
+    [
+        (
+            gold_fact_covid_deaths,
+            ["JURISDICTION_RESIDENCE_NAME"],
+            [("Texas",), ("Ohio",), ("Nowhere",)],
+        ),
+        (
+            gold_fact_covid_deaths,
+            ["JURISDICTION_RESIDENCE_NAME", "MONTH_NAME"],
+            [("Texas", "M0"), ("Ohio", "M1"), ("Maine", "M2"), ("Maine", "M9")],
+        ),
+        (
+            gold_fact_ukhsa_vaccinations,
+            ["AREA_NAME", "AGE_CATEGORY"],
+            [("London", "18+"), ("Leeds", "65+"), ("Leeds", "18+")],
+        ),
+    ],
+)
+@pytest.mark.parametrize("limit, offset", [(3, 0), (2, 1), (100, 0), (5, 50)])
+def test_merged_split_matches_single_statements(
+    engine, model, columns, value_sets, limit, offset
+):
+    with Session(engine) as session:
+        merged = _split(
+            session.exec(
+                _merged_statement(model, columns, value_sets, limit, offset)
+            ).all(),
+            columns,
+        )
+        for values in value_sets:
+            single = [
+                row.model_dump()
+                for row in session.exec(
+                    _single_statement(model, columns, values, limit, offset)
+                ).all()
+            ]
+            assert merged.get(values, []) == single
+
+
+def test_batch_matches_single_routes(engine):
+    client = TestClient(app)
+    names = ["Texas", "Ohio", "Maine"]
+    batch = client.post(
+        "/api/v1/batch",
+        json={
+            "requests": [
+                {
+                    "id": name,
+                    "route": "us_jurisdiction",
+                    "params": {"jurisdiction_residence_name": name, "limit": 4, "offset": 2},
+                }
+                for name in names
+            ]
+        },
+    )
+    assert batch.status_code == 200
+    results = batch.json()["results"]
+
+    result_cache.clear()
+    for name, result in zip(names, results):
+        single = client.get(f"/api/v1/US/{name}", params={"limit": 4, "offset": 2})
+        assert result["status"] == 200
+        assert result["body"] == single.json()
+
+
+def test_batch_charges_one_token_per_sub_request(engine, monkeypatch):
+    monkeypatch.setattr(client_rate_limiter, "_buckets", {})
+    # Slow enough that the bucket doesn't refill between the two batches
+    monkeypatch.setattr(client_rate_limiter, "rate", 0.01)
+    client = TestClient(app)
+    requests = [
+        {"id": str(i), "route": "us_all", "params": {"offset": i}}
+        for i in range(int(client_rate_limiter.burst))
+    ]
+    assert client.post("/api/v1/batch", json={"requests": requests}).status_code == 200
+    assert client.post("/api/v1/batch", json={"requests": requests[:1]}).status_code == 429
+
+    too_many = requests + requests[:1]
+    assert client.post("/api/v1/batch", json={"requests": too_many}).status_code == 413
+
+
+@pytest.mark.parametrize("index_loaded", [False, True])
+def test_batch_not_found_matches_single_routes(engine, monkeypatch, index_loaded):
+    index = DimensionIndex()
+    if index_loaded:
+        with Session(engine) as session:
+            index.build(session)
+    monkeypatch.setattr(dimensions, "dimension_index", index)
+    client = TestClient(app)
+    cases = [
+        ("us_jurisdiction", {"jurisdiction_residence_name": "Nowhere"}, "/api/v1/US/Nowhere"),
+        ("ukhsa_area", {"area_name": "Nowhere"}, "/api/v1/UKHSA/area/Nowhere"),
+    ]
+    batch = client.post(
+        "/api/v1/batch",
+        json={"requests": [{"route": route, "params": params} for route, params, _ in cases]},
+    )
+    for result, (_, _, url) in zip(batch.json()["results"], cases):
+        single = client.get(url)
+        assert single.status_code == 404
+        assert result["status"] == 404
+        assert result["detail"] == single.json()["detail"]
@@ -0,0 +1,63 @@
+from contextlib import ExitStack
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.dependencies import dimensions
+from src.dependencies.admission import admission_controller
+from src.dependencies.dimensions import Dimension, DimensionIndex
+from src.main import app
+from src.routers import dimensions as dimensions_router
+
+
+@pytest.fixture
+def index(engine, monkeypatch):
+    index = DimensionIndex()
+    monkeypatch.setattr(dimensions, "dimension_index", index)
+    monkeypatch.setattr(dimensions_router, "dimension_index", index)
+    return index
+
+
+def test_lookups_do_not_take_a_slot(engine, index, monkeypatch):
+    with Session(engine) as session:
+        index.build(session)
+    monkeypatch.setattr(admission_controller, "queue_timeout", 0.1)
+    client = TestClient(app)
+
+    with ExitStack() as stack:
+        for _ in range(admission_controller.max_concurrency):
+            stack.enter_context(admission_controller.slot())
+        response = client.get("/api/v1/dimensions/us_jurisdictions", params={"prefix": "t"})
+        assert response.status_code == 200
+        assert response.json()["values"] == ["Texas"]
+        assert client.get("/api/v1/dimensions/").status_code == 200
+
+
+def test_cold_index_is_built_on_first_lookup(engine, index):
+    client = TestClient(app)
+    response = client.get("/api/v1/dimensions/ukhsa_areas")
+    assert response.status_code == 200
+    assert response.json()["values"] == ["Leeds", "London"]
+    assert index.loaded
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_search_with_non_positive_limit_returns_nothing(limit):
+    dimension = Dimension(["Texas", "Tennessee", "Ohio"])
+    assert dimension.search("t", limit) == []
+    assert dimension.search("", limit) == []
+
+
+def test_search_limit():
+    dimension = Dimension(["Texas", "Tennessee", "Ohio"])
+    assert dimension.search("t", 1) == ["Tennessee"]
+    assert dimension.search("", 2) == ["Ohio", "Tennessee"]
+    assert dimension.search("T") == ["Tennessee", "Texas"]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_route_rejects_non_positive_limit(engine, index, limit):
+    client = TestClient(app)
+    response = client.get("/api/v1/dimensions/us_jurisdictions", params={"limit": limit})
+    assert response.status_code == 422
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src.dependencies.downsampling import downsample, lttb_indices, minmax_indices
+
+SIZES = [1, 2, 3, 4, 5, 10, 61, 200, 1001]
+BUDGETS = [0, 1, 2, 3, 4, 5, 7, 16, 100, 500, 2000]
+
+
+def _series(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.5, 2.0, n))
+    y = rng.normal(size=n).cumsum()
+    return x, y
+
+
+def _check_indices(kept: np.ndarray, n: int, max_points: int):
+    assert len(kept) <= min(n, max_points)
+    assert np.all(np.diff(kept) > 0)
+    if len(kept):
+        assert kept[0] >= 0 and kept[-1] < n
+    if max_points >= n:
+        assert np.array_equal(kept, np.arange(n))
+    elif max_points >= 2:
+        assert kept[0] == 0 and kept[-1] == n - 1
+
+
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("max_points", BUDGETS)
+def test_lttb_indices_invariants(n, max_points):
+    x, y = _series(n)
+    kept = lttb_indices(x, y, max_points)
+    _check_indices(kept, n, max_points)
+    if 3 <= max_points < n:
+        # LTTB fills its whole budget: one point per bucket plus both ends
+        assert len(kept) == max_points
+
+
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("max_points", BUDGETS)
+def test_minmax_indices_invariants(n, max_points):
+    _, y = _series(n)
+    kept = minmax_indices(y, max_points)
+    _check_indices(kept, n, max_points)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_minmax_indices_keep_extremes(seed):
+    _, y = _series(500, seed)
+    kept = minmax_indices(y, 50)
+    assert int(np.argmin(y)) in kept
+    assert int(np.argmax(y)) in kept
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(100, dtype=float)
+    y = np.zeros(100)
+    y[37] = 10.0
+    assert 37 in lttb_indices(x, y, 10)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_skips_nan_values(method):
+    x, y = _series(300, 1)
+    y[::7] = np.nan
+    kept = downsample(x, y, 40, method)
+    assert len(kept) <= 40
+    assert np.all(np.diff(kept) > 0)
+    assert not np.isnan(y[kept]).any()
+    valid = np.flatnonzero(~np.isnan(y))
+    assert kept[0] == valid[0] and kept[-1] == valid[-1]
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_all_nan(method):
+    x = np.arange(10, dtype=float)
+    y = np.full(10, np.nan)
+    assert len(downsample(x, y, 5, method)) == 0
@@ -0,0 +1,112 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from fastapi import Response
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.dependencies import data_version
+from src.dependencies.admission import admission_controller
+from src.dependencies.circuit_breaker import circuit_breaker
+from src.dependencies.pagination import _approximate_count
+from src.dependencies.resilience import cached_query
+from src.main import app
+from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+
+
+def _hold_all_slots(stack: ExitStack):
+    for _ in range(admission_controller.max_concurrency):
+        stack.enter_context(admission_controller.slot())
+
+
+def test_cache_hits_do_not_wait_for_a_slot(engine, monkeypatch):
+    monkeypatch.setattr(admission_controller, "queue_timeout", 0.1)
+    client = TestClient(app)
+    first = client.get("/api/v1/US/", params={"limit": 5})
+    assert first.headers["X-Cache"] == "MISS"
+
+    with ExitStack() as stack:
+        _hold_all_slots(stack)
+        cached = client.get("/api/v1/US/", params={"limit": 5})
+        assert cached.status_code == 200
+        assert cached.headers["X-Cache"] == "HIT"
+        assert cached.json() == first.json()
+
+        uncached = client.get("/api/v1/US/", params={"limit": 6})
+        assert uncached.status_code == 503
+
+
+def test_cache_hits_notice_table_changes(engine, monkeypatch):
+    fingerprint = ["2024-01-01"]
+    monkeypatch.setattr(data_version, "DATA_VERSION_CHECK_SECONDS", 0)
+    monkeypatch.setattr(
+        data_version, "_read_table_fingerprint", lambda session: fingerprint[0]
+    )
+    client = TestClient(app)
+    assert client.get("/api/v1/US/", params={"limit": 5}).headers["X-Cache"] == "MISS"
+    assert client.get("/api/v1/US/", params={"limit": 5}).headers["X-Cache"] == "HIT"
+
+    fingerprint[0] = "2024-01-02"
+    assert client.get("/api/v1/US/", params={"limit": 5}).headers["X-Cache"] == "MISS"
+
+
+def test_writes_by_other_workers_invalidate_the_cache(engine):
+    client = TestClient(app)
+    first = client.get("/api/v1/US/", params={"limit": 1})
+    assert first.headers["X-Cache"] == "MISS"
+
+    # Another worker process changes the record and marks the shared version file
+    with Session(engine) as session:
+        record = session.get(gold_fact_covid_deaths, 1)
+        record.MONTH_NAME = "Zed"
+        session.add(record)
+        session.commit()
+    with open(data_version.DATA_VERSION_FILE, "a"):
+        os.utime(data_version.DATA_VERSION_FILE, ns=(1, time.time_ns() + 1))
+
+    fresh = client.get("/api/v1/US/", params={"limit": 1})
+    assert fresh.headers["X-Cache"] == "MISS"
+    assert fresh.json()[0]["MONTH_NAME"] == "Zed"
+
+
+def test_reload_after_data_change_is_single_flight(engine, monkeypatch):
+    statement = select(gold_fact_covid_deaths).limit(3)
+    with Session(engine) as session:
+        cached_query(session, Response(), statement)
+    data_version.bump_data_version()
+
+    loads = []
+    original_exec = Session.exec
+
+    def slow_exec(self, *args, **kwargs):
+        loads.append(1)
+        time.sleep(0.2)
+        return original_exec(self, *args, **kwargs)
+
+    monkeypatch.setattr(Session, "exec", slow_exec)
+
+    def read():
+        response = Response()
+        with Session(engine) as session:
+            cached_query(session, response, statement)
+        return response.headers["X-Cache"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        caches = list(pool.map(lambda _: read(), range(8)))
+    assert len(loads) == 1
+    assert caches.count("MISS") == 1
+    assert caches.count("HIT") == 7
+
+
+def test_approximate_count_is_skipped_while_breaker_is_open(engine, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "state", circuit_breaker.OPEN)
+    monkeypatch.setattr(circuit_breaker, "_opened_at", time.monotonic())
+    executed = []
+    monkeypatch.setattr(
+        Session, "execute", lambda self, *args, **kwargs: executed.append(args)
+    )
+    with Session(engine) as session:
+        assert _approximate_count(session, gold_fact_covid_deaths) is None
+    assert executed == []
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.main import app
+from src.models.gold_fact_covid_deaths import gold_fact_covid_deaths
+
+
+def test_series_response_is_documented():
+    schema = app.openapi()["paths"]["/api/v1/US/series/"]["get"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"]["$ref"].endswith("/SeriesResponse")
+
+
+def test_series_months_in_calendar_order(engine):
+    with Session(engine) as session:
+        for month in range(1, 13):
+            session.add(
+                gold_fact_covid_deaths(
+                    COVID_DEATHS_KEY=100 + month,
+                    JURISDICTION_RESIDENCE_NAME="Vermont",
+                    YEAR=2021,
+                    MONTH_CODE=str(month),
+                    COVID_DEATHS=float(month),
+                )
+            )
+        session.commit()
+
+    client = TestClient(app)
+    response = client.get(
+        "/api/v1/US/series/",
+        params={"jurisdiction_residence_name": "Vermont", "metrics": "COVID_DEATHS"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["points_per_series"] == body["max_points"]
+    (series,) = body["series"]
+    assert series["month_code"] == [str(month) for month in range(1, 13)]
+    assert series["value"] == [float(month) for month in range(1, 13)]